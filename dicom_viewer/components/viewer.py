@@ -342,6 +342,8 @@ def viewer_sidebar() -> rx.Component:
                     key=DicomViewerState.window_center,
                     default_value=DicomViewerState.window_center,
                     on_change=DicomViewerState.update_window_center.throttle(100),
+                    on_mouse_down=DicomViewerState.begin_drag,
+                    on_mouse_up=DicomViewerState.end_drag,
                     class_name="w-full h-1.5 bg-slate-700 rounded-lg appearance-none cursor-pointer hover:bg-slate-600 transition-colors accent-blue-500",
                 ),
                 class_name="mb-4",
@@ -364,6 +366,8 @@ def viewer_sidebar() -> rx.Component:
                     key=DicomViewerState.window_width,
                     default_value=DicomViewerState.window_width,
                     on_change=DicomViewerState.update_window_width.throttle(100),
+                    on_mouse_down=DicomViewerState.begin_drag,
+                    on_mouse_up=DicomViewerState.end_drag,
                     class_name="w-full h-1.5 bg-slate-700 rounded-lg appearance-none cursor-pointer hover:bg-slate-600 transition-colors accent-blue-500",
                 ),
             ),
@@ -459,5 +463,5 @@ def viewer_layout() -> rx.Component:
             viewer_sidebar(),
             class_name="flex flex-1 overflow-hidden min-h-0",
         ),
-        class_name="flex flex-col h-screen w-screen bg-slate-950 text-slate-100 font-['Inter'] overflow-hidden",
+        class_name="flex flex-col h-screen w-screen bg-slate-950 text-slate-100 font-['Inter',system-ui,sans-serif] overflow-hidden",
     )
@@ -1,11 +1,59 @@
 import reflex as rx
-from dicom_viewer.states.dicom_state import DicomViewerState
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+
+from dicom_viewer.states.dicom_state import DicomViewerState, get_frame
 from dicom_viewer.components.loading_spinner import loading_spinner
 from dicom_viewer.components.viewer import viewer_layout
 
 
+async def _serve_frame(request):
+    """Serve an encoded frame from the in-memory store (DICOM_FRAME_URLS=1).
+
+    Tokens are content hashes, so responses can be cached as immutable.
+    """
+    token = request.path_params["token"].split(".", 1)[0]
+    entry = get_frame(token)
+    if entry is None:
+        return PlainTextResponse("frame not found", status_code=404)
+    mime, payload = entry
+    return Response(
+        payload,
+        media_type=mime,
+        headers={"Cache-Control": "max-age=3600, immutable"},
+    )
+
+
+_frame_api = Starlette(routes=[Route("/frames/{token}", _serve_frame)])
+
+
+# Single CSS background icons for list rows. Long lists would otherwise mount
+# one Lucide React component per row; a shared class renders the same glyph
+# with zero per-row component cost. Stroke color is slate-400 (#94a3b8).
+_ROW_ICON_CSS = """
+.row-folder-icon, .row-file-icon {
+  display: inline-block;
+  width: 1rem;
+  height: 1rem;
+  flex-shrink: 0;
+  background-repeat: no-repeat;
+  background-size: contain;
+}
+.row-folder-icon {
+  margin-right: 0.5rem;
+  background-image: url("data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 24 24' fill='none' stroke='%2394a3b8' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'%3E%3Cpath d='M20 20a2 2 0 0 0 2-2V8a2 2 0 0 0-2-2h-7.9a2 2 0 0 1-1.69-.9L9.6 3.9A2 2 0 0 0 7.93 3H4a2 2 0 0 0-2 2v13a2 2 0 0 0 2 2Z'/%3E%3C/svg%3E");
+}
+.row-file-icon {
+  margin-right: 0.75rem;
+  background-image: url("data:image/svg+xml,%3Csvg xmlns='http://www.w3.org/2000/svg' viewBox='0 0 24 24' fill='none' stroke='%2394a3b8' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'%3E%3Cpath d='M15 2H6a2 2 0 0 0-2 2v16a2 2 0 0 0 2 2h12a2 2 0 0 0 2-2V7Z'/%3E%3Cpath d='M14 2v4a2 2 0 0 0 2 2h4'/%3E%3Ccircle cx='10' cy='12' r='2'/%3E%3Cpath d='m20 17-1.296-1.296a2.41 2.41 0 0 0-3.408 0L9 22'/%3E%3C/svg%3E");
+}
+"""
+
+
+@rx.memo
 def header() -> rx.Component:
-    """Application header."""
+    """Application header (fully static, so React can skip re-rendering it)."""
     return rx.el.header(
         rx.el.div(
             rx.icon("activity", class_name="h-6 w-6 text-blue-400 mr-3"),
@@ -30,7 +78,6 @@ def directory_selector() -> rx.Component:
             rx.el.div(
                 rx.el.input(
                     placeholder="/path/to/dicom/series",
-                    on_change=DicomViewerState.set_directory,
                     on_focus=DicomViewerState.open_directory_dialog,
                     class_name="flex-1 bg-slate-800 border-slate-700 text-slate-100 rounded-l-lg px-4 py-3 focus:ring-2 focus:ring-blue-500 focus:border-transparent outline-none transition-all placeholder-slate-500 w-full",
                     value=DicomViewerState.directory_path,
@@ -61,17 +108,18 @@ def directory_selector() -> rx.Component:
     )
 
 
+_CHIP_BASE = "px-3 py-1 rounded-full "
+_CHIP_ACTIVE = _CHIP_BASE + "bg-blue-600/20 text-blue-300 border border-blue-500/40"
+_CHIP_IDLE = _CHIP_BASE + "bg-slate-900 text-slate-400 border border-slate-800"
+
+
 def workflow_steps() -> rx.Component:
     """Step indicator for the basic flow."""
 
     def step_chip(label: str, is_active) -> rx.Component:
         return rx.el.div(
             rx.el.span(label, class_name="text-xs font-medium"),
-            class_name=rx.cond(
-                is_active,
-                "px-3 py-1 rounded-full bg-blue-600/20 text-blue-300 border border-blue-500/40",
-                "px-3 py-1 rounded-full bg-slate-900 text-slate-400 border border-slate-800",
-            ),
+            class_name=rx.cond(is_active, _CHIP_ACTIVE, _CHIP_IDLE),
         )
 
     return rx.el.div(
@@ -131,19 +179,16 @@ def directory_browser_dialog() -> rx.Component:
             rx.el.div(
                 rx.foreach(
                     DicomViewerState.directory_browser_dirs,
-                    lambda path: rx.el.button(
+                    lambda path, i: rx.el.button(
                         rx.el.div(
-                            rx.icon(
-                                "folder",
-                                class_name="h-4 w-4 mr-2 text-slate-400",
-                            ),
+                            rx.el.span(class_name="row-folder-icon"),
                             rx.el.span(
                                 path,
                                 class_name="text-xs text-slate-200 font-mono break-all",
                             ),
                             class_name="flex items-center",
                         ),
-                        on_click=lambda: DicomViewerState.open_directory(path),
+                        on_click=lambda: DicomViewerState.open_directory_at(i),
                         class_name="w-full text-left px-3 py-2 rounded-md hover:bg-slate-800 transition-colors",
                     ),
                 ),
@@ -154,23 +199,29 @@ def directory_browser_dialog() -> rx.Component:
     )
 
 
+_FILE_ROW_CLASS = (
+    "flex items-center p-3 rounded-lg bg-slate-800/50 border border-slate-700 "
+    "hover:bg-slate-800 cursor-pointer transition-all "
+    "data-[selected=true]:bg-blue-600/20 data-[selected=true]:border-blue-500/50 "
+    "data-[selected=true]:hover:bg-blue-600/20"
+)
+
+
 def file_list_item(filename: str, index: int) -> rx.Component:
     """Individual file item in the list."""
-    is_selected = DicomViewerState.current_index == index
     return rx.el.div(
         rx.el.div(
-            rx.icon("file-image", class_name="h-4 w-4 mr-3 text-slate-400"),
+            rx.el.span(class_name="row-file-icon"),
             rx.el.span(
                 filename, class_name="text-sm text-slate-300 truncate font-mono"
             ),
             class_name="flex items-center flex-1 min-w-0",
         ),
         on_click=lambda: DicomViewerState.handle_file_selection(index),
-        class_name=rx.cond(
-            is_selected,
-            "flex items-center p-3 rounded-lg bg-blue-600/20 border border-blue-500/50 cursor-pointer transition-all",
-            "flex items-center p-3 rounded-lg bg-slate-800/50 border border-slate-700 hover:bg-slate-800 cursor-pointer transition-all",
-        ),
+        custom_attrs={
+            "data-selected": (DicomViewerState.current_index == index).to_string()
+        },
+        class_name=_FILE_ROW_CLASS,
     )
 
 
@@ -186,7 +237,7 @@ def file_browser() -> rx.Component:
                         class_name="text-lg font-semibold text-slate-100",
                     ),
                     rx.el.span(
-                        f"{DicomViewerState.dicom_files.length()} images",
+                        DicomViewerState.file_count_label,
                         class_name="text-xs font-medium bg-blue-900 text-blue-200 px-2 py-1 rounded-full",
                     ),
                     class_name="flex items-center gap-3",
@@ -210,9 +261,24 @@ def file_browser() -> rx.Component:
             ),
             rx.el.div(
                 rx.foreach(
-                    DicomViewerState.file_names, lambda name, i: file_list_item(name, i)
+                    DicomViewerState.visible_file_names,
+                    lambda name, i: file_list_item(name, i),
+                ),
+                rx.cond(
+                    DicomViewerState.hidden_file_count > 0,
+                    rx.el.button(
+                        f"Show more ({DicomViewerState.hidden_file_count} remaining)",
+                        on_click=DicomViewerState.show_more_files,
+                        class_name="w-full p-3 rounded-lg bg-slate-800/50 border border-slate-700 hover:bg-slate-800 text-sm text-slate-400 transition-all",
+                    ),
+                ),
+                class_name=(
+                    "grid gap-2 max-h-[500px] overflow-y-auto pr-2 custom-scrollbar "
+                    # Let the browser skip layout/paint for rows scrolled out
+                    # of view; 46px matches a file row's rendered height.
+                    "[&>div]:[content-visibility:auto] "
+                    "[&>div]:[contain-intrinsic-size:auto_46px]"
                 ),
-                class_name="grid gap-2 max-h-[500px] overflow-y-auto pr-2 custom-scrollbar",
             ),
             class_name="max-w-2xl mx-auto w-full bg-slate-900/50 p-6 rounded-xl border border-slate-800",
         ),
@@ -226,10 +292,19 @@ def landing_content() -> rx.Component:
         directory_selector(),
         rx.cond(
             DicomViewerState.is_loading,
-            rx.el.div(loading_spinner(), class_name="flex justify-center py-8"),
+            rx.el.div(
+                loading_spinner(),
+                rx.cond(
+                    DicomViewerState.scan_total > 0,
+                    rx.el.p(
+                        DicomViewerState.scan_progress_text,
+                        class_name="text-xs text-slate-400 font-mono mt-3",
+                    ),
+                ),
+                class_name="flex flex-col items-center justify-center py-8",
+            ),
             file_browser(),
         ),
-        directory_browser_dialog(),
         class_name="flex-1 w-full max-w-7xl mx-auto",
     )
 
@@ -238,20 +313,29 @@ def index() -> rx.Component:
     return rx.el.div(
         header(),
         rx.el.main(landing_content(), class_name="flex-1 bg-slate-950 min-h-screen"),
-        class_name="flex flex-col min-h-screen font-['Inter'] bg-slate-950 text-slate-100",
+        class_name="flex flex-col min-h-screen font-['Inter',system-ui,sans-serif] bg-slate-950 text-slate-100",
     )
 
 
 app = rx.App(
     theme=rx.theme(appearance="light"),
     head_components=[
+        rx.el.style(_ROW_ICON_CSS),
         rx.el.link(rel="preconnect", href="https://fonts.googleapis.com"),
         rx.el.link(rel="preconnect", href="https://fonts.gstatic.com", cross_origin=""),
         rx.el.link(
             href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&display=swap",
             rel="stylesheet",
         ),
+        # Fetch the viewer route while the user reviews scan results so the
+        # "Open Viewer" transition doesn't stall on its JS chunk.
+        rx.el.link(rel="prefetch", href="/viewer"),
     ],
+    api_transformer=_frame_api,
 )
 app.add_page(index, route="/")
-app.add_page(viewer_layout, route="/viewer")
+# on_load covers direct navigation and browser history; repeats are cheap
+# because the render cache short-circuits an already-loaded slice.
+app.add_page(
+    viewer_layout, route="/viewer", on_load=DicomViewerState.load_selected_image
+)
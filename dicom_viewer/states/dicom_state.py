@@ -1,13 +1,618 @@
 import reflex as rx
+import asyncio
+import hashlib
+import hmac
 import os
 import sys
 import pydicom
+from pydicom.pixels import pixel_array as pixel_array_from
+from pydicom.pixels.processing import apply_modality_lut
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+from typing import ClassVar, Mapping
 from pathlib import Path
 import logging
 import numpy as np
 from PIL import Image
 import io
 import base64
+import struct
+import zlib
+
+try:
+    from numba import njit, prange
+
+    _HAS_NUMBA = True
+except ImportError:
+    _HAS_NUMBA = False
+
+try:
+    import cv2
+
+    _HAS_CV2 = True
+except ImportError:
+    _HAS_CV2 = False
+
+if _HAS_NUMBA:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _window_kernel(arr, slope, intercept, center, width, out):
+        """Fused rescale+window+quantize: one pass, no temporaries."""
+        lo = center - width / 2.0
+        hi = center + width / 2.0
+        scale = 255.0 / (hi - lo) if hi > lo else 0.0
+        for i in prange(arr.shape[0]):
+            for j in range(arr.shape[1]):
+                v = arr[i, j] * slope + intercept
+                if v <= lo:
+                    out[i, j] = 0
+                elif v >= hi:
+                    out[i, j] = 255
+                else:
+                    out[i, j] = np.uint8((v - lo) * scale)
+
+# Upper bound mirrors the stdlib ThreadPoolExecutor default; scanning is
+# latency-bound, so extra threads mostly hide per-file I/O waits.
+_DEFAULT_SCAN_THREADS = min(32, (os.cpu_count() or 4) + 4)
+
+
+# Directory-browser listings keyed by absolute path, storing the directory
+# mtime alongside the child list so stale entries are detected with one stat.
+_DIR_CACHE: OrderedDict[str, tuple[float, list[str]]] = OrderedDict()
+_DIR_CACHE_SIZE = 128
+
+# Decoded slices keyed by file path. Entries hold float32 HU buffers
+# (~1 MB each at 512x512), so the cache is kept deliberately small; it only
+# needs to cover the neighbours a sequential scroll touches next.
+_SLICE_CACHE: OrderedDict[str, tuple] = OrderedDict()
+_SLICE_CACHE_SIZE = 8
+
+# Header tags needed to order a series; everything else is skipped while
+# scanning so pydicom never parses the bulk of each dataset.
+_SCAN_TAGS = [
+    "SeriesInstanceUID",
+    "ImagePositionPatient",
+    "ImageOrientationPatient",
+    "InstanceNumber",
+    "SliceLocation",
+]
+
+
+def _fold_meta_summary(per_file: list[dict[str, str]]) -> dict[str, dict]:
+    """Fold per-slice tag values into constant and varying groups.
+
+    Most header values repeat across every slice of a series; storing each
+    constant once and only the varying tags as per-slice arrays keeps the
+    scan summary small regardless of series length.
+    """
+    const: dict[str, str] = {}
+    varying: dict[str, list[str]] = {}
+    if not per_file:
+        return {"const": const, "varying": varying}
+    for tag in set().union(*per_file):
+        values = [entry.get(tag, "") for entry in per_file]
+        if all(value == values[0] for value in values):
+            const[tag] = values[0]
+        else:
+            varying[tag] = values
+    return {"const": const, "varying": varying}
+
+
+def _sort_scan_entries(entries: list[tuple]) -> list[tuple]:
+    """Order scan entries by their sort keys with one np.lexsort pass.
+
+    Comparing thousands of Python tuples is interpreter-bound; packing each
+    key component into its own array lets NumPy sort them natively. Series
+    UIDs are folded to integer codes first (np.unique assigns codes in
+    lexical order, matching the tuple comparison they replace).
+    """
+    keys = [entry[0] for entry in entries]
+    series_codes = np.unique([key[0] for key in keys], return_inverse=True)[1]
+    primaries = np.asarray([key[1] for key in keys], dtype=np.float64)
+    secondaries = np.asarray([key[2] for key in keys], dtype=np.float64)
+    names = np.asarray([key[3] for key in keys])
+    order = np.lexsort((names, secondaries, primaries, series_codes))
+    return [entries[i] for i in order]
+
+
+def _compute_slice_position(ds) -> float | None:
+    """Compute slice position along the normal direction when possible."""
+    pos = ds.get("ImagePositionPatient", None)
+    iop = ds.get("ImageOrientationPatient", None)
+    if pos is not None and iop is not None:
+        try:
+            if len(iop) >= 6 and len(pos) >= 3:
+                # Scalar cross/dot: for fixed 3-vectors the arithmetic is
+                # a handful of FMAs, far below NumPy's per-call dispatch
+                # cost, and this runs once per file during a scan.
+                rx_, ry, rz = float(iop[0]), float(iop[1]), float(iop[2])
+                cx, cy, cz = float(iop[3]), float(iop[4]), float(iop[5])
+                nx = ry * cz - rz * cy
+                ny = rz * cx - rx_ * cz
+                nz = rx_ * cy - ry * cx
+                if nx * nx + ny * ny + nz * nz > 0:
+                    return (
+                        nx * float(pos[0])
+                        + ny * float(pos[1])
+                        + nz * float(pos[2])
+                    )
+        except Exception:
+            pass
+    if pos is not None:
+        try:
+            if len(pos) >= 3:
+                return float(pos[2])
+        except Exception:
+            pass
+    slice_location = ds.get("SliceLocation", None)
+    if slice_location is not None:
+        try:
+            return float(slice_location)
+        except Exception:
+            return None
+    return None
+
+def _dicom_sort_key(ds, name_lower: str) -> tuple:
+    """Return a stable sort key for DICOM slice ordering."""
+    series_uid = str(ds.get("SeriesInstanceUID", ""))
+    position = _compute_slice_position(ds)
+    instance = ds.get("InstanceNumber", None)
+    try:
+        instance_val = float(instance) if instance is not None else None
+    except Exception:
+        instance_val = None
+    primary = position if position is not None else (
+        instance_val if instance_val is not None else float("inf")
+    )
+    secondary = instance_val if instance_val is not None else float("inf")
+    return (series_uid, primary, secondary, name_lower)
+
+
+@lru_cache(maxsize=4096)
+def _cached_sort_entry(
+    path_str: str, mtime_ns: int, size: int
+) -> tuple[tuple, str, str, dict[str, str]] | None:
+    """Parse one file's scan entry; mtime/size only rotate the cache key."""
+    try:
+        with open(path_str, "rb") as f:
+            # Check the DICM magic bytes first so .DS_Store, JPEGs and the
+            # like are rejected for the cost of one 4-byte read instead of
+            # a parser start-up plus a logged exception.
+            f.seek(128)
+            if f.read(4) != b"DICM":
+                return None
+            f.seek(0)
+            ds = pydicom.dcmread(
+                f,
+                stop_before_pixels=True,
+                specific_tags=_SCAN_TAGS,
+                defer_size="1 KB",
+            )
+            meta = {tag: str(ds.get(tag, "")) for tag in _SCAN_TAGS}
+            name = os.path.basename(path_str)
+            sort_key = _dicom_sort_key(ds, name.lower())
+        return (sort_key, path_str, name, meta)
+    except Exception as e:
+        logging.exception(f"Skipping invalid DICOM file {path_str}: {e}")
+        return None
+
+
+# Straight string-valued metadata fields as (state attr, DICOM keyword);
+# everything needing formatting (position, spacing, thickness) stays inline.
+_META_STR_TAGS = (
+    ("patient_name", "PatientName"),
+    ("patient_id", "PatientID"),
+    ("study_date", "StudyDate"),
+    ("modality", "Modality"),
+    ("study_description", "StudyDescription"),
+    ("series_description", "SeriesDescription"),
+)
+
+
+_DATA_URL_PREFIXES = {
+    "image/jpeg": b"data:image/jpeg;base64,",
+    "image/png": b"data:image/png;base64,",
+}
+
+# Opt-in transport that serves encoded frames from /frames/<token> instead of
+# inlining them as base64 in the state diff (skips the 4/3 base64 inflation
+# and lets the browser cache repeats). Off by default because in dev the
+# frontend and backend run on different origins; set DICOM_FRAME_URLS=1 and,
+# if needed, DICOM_FRAME_BASE_URL to the backend origin to enable it.
+_FRAME_URLS_ENABLED = os.getenv("DICOM_FRAME_URLS", "") == "1"
+_FRAME_BASE_URL = os.getenv("DICOM_FRAME_BASE_URL", "").rstrip("/")
+_FRAME_STORE: OrderedDict[str, tuple[str, bytes]] = OrderedDict()
+_FRAME_STORE_SIZE = 8
+
+
+# Finished renders keyed by the full render key, so scrubbing window
+# presets or slices back and forth replays encoded frames instead of
+# re-windowing and re-deflating them. ~32 data URLs of a few hundred KB.
+_RENDER_CACHE: OrderedDict[tuple, str] = OrderedDict()
+_RENDER_CACHE_SIZE = 32
+
+
+def _store_frame(mime: str, payload: bytes) -> str:
+    """Keep an encoded frame for the /frames endpoint; returns its token.
+
+    Content-hash tokens make repeated renders cache-friendly: scrubbing back
+    to a slice yields the same URL and the browser skips the request.
+    """
+    token = hashlib.sha1(payload).hexdigest()[:20]
+    _FRAME_STORE[token] = (mime, payload)
+    _FRAME_STORE.move_to_end(token)
+    while len(_FRAME_STORE) > _FRAME_STORE_SIZE:
+        _FRAME_STORE.popitem(last=False)
+    return token
+
+
+def get_frame(token: str) -> tuple[str, bytes] | None:
+    """Look up a stored frame by token for the backend route."""
+    return _FRAME_STORE.get(token)
+
+
+def _encode_gray_png(img_uint8: np.ndarray) -> bytes:
+    """Write a 2-D uint8 array as an 8-bit grayscale PNG with stdlib zlib.
+
+    One interleave pass for the per-row filter bytes plus a single
+    level-1 deflate; skips Pillow's image-object construction and mode
+    machinery, whose per-call overhead dominates on sub-megapixel frames.
+    """
+    height, width = img_uint8.shape
+    rows = np.empty((height, width + 1), dtype=np.uint8)
+    rows[:, 0] = 0  # filter type None for every scanline
+    rows[:, 1:] = img_uint8
+
+    def _chunk(tag: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data))
+            + tag
+            + data
+            + struct.pack(">I", zlib.crc32(tag + data))
+        )
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 0, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + _chunk(b"IHDR", header)
+        + _chunk(b"IDAT", zlib.compress(rows.tobytes(), 1))
+        + _chunk(b"IEND", b"")
+    )
+
+
+def _encode_frame(img_uint8: np.ndarray, image_format: str) -> tuple[str, bytes]:
+    """Encode a uint8 frame, returning its MIME type and encoded bytes.
+
+    JPEG at quality 85 roughly halves the payload shipped over the state
+    websocket versus PNG; "png" keeps the lossless path. cv2.imencode is
+    several times faster than PIL's chunked encoder on 512x512 frames, so
+    OpenCV is preferred with PIL as the fallback. Frames with an alpha
+    channel always use PNG since JPEG cannot carry it.
+    """
+    use_jpeg = image_format == "jpeg" and not (
+        img_uint8.ndim == 3 and img_uint8.shape[-1] == 4
+    )
+    if _HAS_CV2:
+        frame = img_uint8
+        if frame.ndim == 3:
+            # imencode expects BGR(A) channel order.
+            order = [2, 1, 0, 3] if frame.shape[-1] == 4 else [2, 1, 0]
+            frame = np.ascontiguousarray(frame[..., order])
+        if use_jpeg:
+            ok, encoded = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        else:
+            ok, encoded = cv2.imencode(".png", frame, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+        if ok:
+            return ("image/jpeg" if use_jpeg else "image/png", encoded.tobytes())
+    buffer = io.BytesIO()
+    if use_jpeg:
+        if img_uint8.ndim == 2:
+            # frombuffer wraps the array read-only without the memcpy
+            # Image.fromarray does; the encoder only reads from it.
+            pil_image = Image.frombuffer(
+                "L",
+                (img_uint8.shape[1], img_uint8.shape[0]),
+                np.ascontiguousarray(img_uint8),
+                "raw",
+                "L",
+                0,
+                1,
+            )
+        else:
+            pil_image = Image.fromarray(img_uint8)
+        pil_image.save(buffer, format="JPEG", quality=85)
+        return "image/jpeg", buffer.getvalue()
+    if img_uint8.ndim == 2:
+        return "image/png", _encode_gray_png(img_uint8)
+    # Frames are displayed once and discarded, so zlib level 1 beats
+    # Pillow's default level 6 on encode time for a few percent more bytes.
+    Image.fromarray(img_uint8).save(buffer, format="PNG", compress_level=1)
+    return "image/png", buffer.getvalue()
+
+
+@lru_cache(maxsize=8)
+def _window_lut(
+    signed: bool,
+    slope: float,
+    intercept: float,
+    center: float,
+    width: float,
+    invert: bool,
+) -> np.ndarray:
+    """65536-entry uint8 LUT mapping raw 16-bit pixel values to display.
+
+    Index order matches the uint16 view of the raw array, so signed inputs
+    wrap through the two's-complement reinterpretation. Cached per window
+    setting; callers index it, never mutate it.
+    """
+    idx = np.arange(65536, dtype=np.uint16)
+    vals = (idx.view(np.int16) if signed else idx).astype(np.float32)
+    vals *= np.float32(slope)
+    vals += np.float32(intercept)
+    if width != 0:
+        vals *= np.float32(255.0 / width)
+        vals += np.float32((width / 2 - center) * (255.0 / width))
+        np.clip(vals, 0.0, 255.0, out=vals)
+        lut = vals.astype(np.uint8)
+    else:
+        lut = np.zeros(65536, dtype=np.uint8)
+    if invert:
+        np.subtract(255, lut, out=lut)
+    return lut
+
+
+def _downscale_frame(img_uint8: np.ndarray, max_dim: int) -> np.ndarray:
+    """Shrink a frame so its longest side fits max_dim; no-op when it fits.
+
+    Area interpolation keeps windowed grayscale smooth when shrinking.
+    """
+    scale = max_dim / max(img_uint8.shape[0], img_uint8.shape[1])
+    if scale >= 1.0:
+        return img_uint8
+    size = (int(img_uint8.shape[1] * scale), int(img_uint8.shape[0] * scale))
+    if _HAS_CV2:
+        return cv2.resize(img_uint8, size, interpolation=cv2.INTER_AREA)
+    return np.asarray(Image.fromarray(img_uint8).resize(size, Image.BOX))
+
+
+@lru_cache(maxsize=128)
+def _normalize_directory_path(path: str, default_dir: str) -> Path:
+    """Resolve a browser path to an existing directory, falling back sanely.
+
+    Dialog events normalize the same path several times per interaction
+    (open, go-up, the can_go_up var); caching spares the repeated
+    exists/is_dir syscalls. Keyed on the string, so a directory deleted
+    mid-session is served stale until the entry ages out — acceptable for
+    a UI picker.
+    """
+    candidate = Path(path).expanduser()
+    if candidate.exists() and candidate.is_dir():
+        return candidate
+    fallback = Path(default_dir).expanduser()
+    return fallback if fallback.exists() and fallback.is_dir() else Path("/")
+
+
+def _scan_thread_count() -> int:
+    """Number of worker threads for directory scans (DICOM_SCAN_THREADS)."""
+    try:
+        count = int(os.getenv("DICOM_SCAN_THREADS", ""))
+    except ValueError:
+        return _DEFAULT_SCAN_THREADS
+    return count if count > 0 else _DEFAULT_SCAN_THREADS
+
+
+# One pool shared by every scan so repeated directory opens reuse warm
+# threads instead of paying pool spin-up/teardown per scan.
+_SCAN_EXECUTOR = ThreadPoolExecutor(
+    max_workers=_scan_thread_count(), thread_name_prefix="dicom-scan"
+)
+
+
+
+# Windowing presets as (center, width); hoisted so apply_preset does a
+# lookup instead of rebuilding a 31-entry dict per click, and so the
+# options list is derived from one source of truth. Proxied read-only so
+# nothing can mutate the shared table at runtime.
+_PRESETS: Mapping[str, tuple[float, float]] = MappingProxyType({
+        "Soft Tissue": (40.0, 400.0),
+        "Lung": (-600.0, 1500.0),
+        "Bone": (300.0, 1500.0),
+        "Brain": (40.0, 80.0),
+        "Abdomen": (50.0, 400.0),
+        "Liver": (60.0, 150.0),
+        "Mediastinum": (40.0, 350.0),
+        "Spine": (30.0, 300.0),
+        "Pelvis": (50.0, 450.0),
+        "Head/Neck": (50.0, 250.0),
+        "CTA/Vascular": (150.0, 600.0),
+        "Kidney": (30.0, 300.0),
+        "Pancreas": (50.0, 200.0),
+        "Trauma": (50.0, 500.0),
+        "Subdural": (50.0, 130.0),
+        "Stroke": (35.0, 30.0),
+        "Body": (40.0, 450.0),
+        "Extremity/MSK": (40.0, 350.0),
+        "Temporal Bone": (700.0, 4000.0),
+        "Sinus": (50.0, 300.0),
+        "Angio Bone Sub": (300.0, 1200.0),
+        "Lung HRCT": (-700.0, 1200.0),
+        "Orbits": (50.0, 300.0),
+        "CTA Head/Neck": (180.0, 700.0),
+        "Arterial": (150.0, 600.0),
+        "Venous": (100.0, 500.0),
+        "Colon/Bowel": (50.0, 400.0),
+        "Adrenal": (40.0, 300.0),
+        "Gallbladder": (30.0, 200.0),
+        "Skin/Subcutaneous": (50.0, 250.0),
+        "Cardiac": (75.0, 350.0),
+    })
+
+
+# Tutorial pages exist once per language; anchors are derived from the preset
+# name, so the full language x preset link table never needs to be stored
+# (or copied into each session's state).
+_TUTORIAL_PAGES = {
+    # Use same-origin static assets so the tutorial can be embedded in an iframe.
+    # (Many external sites, including Wikipedia, block iframe embedding.)
+    "en": "/tutorials/windowing_en.html",
+    "zh-TW": "/tutorials/windowing_zh_tw.html",
+    "zh-CN": "/tutorials/windowing_zh_cn.html",
+    "es": "/tutorials/windowing_es.html",
+}
+
+_PRESET_DESCRIPTIONS: dict[str, dict[str, str]] = {
+    "en": {
+        "Soft Tissue": "Good for most organs and muscles.",
+        "Lung": "Best for seeing lungs and airways.",
+        "Bone": "Makes bones and fractures easy to see.",
+        "Brain": "Standard view for brain tissue.",
+        "Abdomen": "General view for belly organs.",
+        "Liver": "Clearer view of the liver.",
+        "Mediastinum": "Shows the middle chest area.",
+        "Spine": "Helps check the spine and canal.",
+        "Pelvis": "General view of pelvic organs.",
+        "Head/Neck": "Shows soft tissues in head/neck.",
+        "CTA/Vascular": "Shows blood vessels with contrast.",
+        "Kidney": "Helps see kidneys clearly.",
+        "Pancreas": "Better view of the pancreas.",
+        "Trauma": "Wide view for injuries.",
+        "Subdural": "Helps see bleeding under the skull.",
+        "Stroke": "Narrow brain view for early stroke.",
+        "Body": "Wide soft-tissue view for whole body.",
+        "Extremity/MSK": "For arms/legs soft tissues.",
+        "Temporal Bone": "Very wide view for ear bones.",
+        "Sinus": "For sinuses around the nose.",
+        "Angio Bone Sub": "Shows vessels after bone is removed.",
+        "Lung HRCT": "Extra detail for lungs.",
+        "Orbits": "For the eye sockets.",
+        "CTA Head/Neck": "Vessels in head and neck.",
+        "Arterial": "Artery phase vessels.",
+        "Venous": "Vein phase vessels.",
+        "Colon/Bowel": "For colon and bowel walls.",
+        "Adrenal": "For adrenal glands.",
+        "Gallbladder": "For gallbladder and bile ducts.",
+        "Skin/Subcutaneous": "For skin and fat layer.",
+        "Cardiac": "For heart soft tissues.",
+    },
+    "zh-TW": {
+        "Soft Tissue": "看大部分器官與肌肉。",
+        "Lung": "看肺部與氣道。",
+        "Bone": "讓骨頭和骨折更清楚。",
+        "Brain": "腦部常用視窗。",
+        "Abdomen": "看腹部器官。",
+        "Liver": "看肝臟更清楚。",
+        "Mediastinum": "看胸部中間區域。",
+        "Spine": "看脊椎與椎管。",
+        "Pelvis": "看骨盆器官。",
+        "Head/Neck": "看頭頸部軟組織。",
+        "CTA/Vascular": "看打顯影劑的血管。",
+        "Kidney": "看腎臟更清楚。",
+        "Pancreas": "看胰臟更清楚。",
+        "Trauma": "看受傷的大範圍。",
+        "Subdural": "看頭骨下出血。",
+        "Stroke": "看早期中風。",
+        "Body": "全身軟組織大範圍。",
+        "Extremity/MSK": "看四肢軟組織。",
+        "Temporal Bone": "看耳朵附近骨頭。",
+        "Sinus": "看鼻竇。",
+        "Angio Bone Sub": "扣掉骨頭後看血管。",
+        "Lung HRCT": "更細的肺部細節。",
+        "Orbits": "看眼眶。",
+        "CTA Head/Neck": "看頭頸部血管。",
+        "Arterial": "動脈期血管。",
+        "Venous": "靜脈期血管。",
+        "Colon/Bowel": "看腸道和腸壁。",
+        "Adrenal": "看腎上腺。",
+        "Gallbladder": "看膽囊和膽道。",
+        "Skin/Subcutaneous": "看皮膚和皮下脂肪。",
+        "Cardiac": "看心臟軟組織。",
+    },
+    "zh-CN": {
+        "Soft Tissue": "看大部分器官和肌肉。",
+        "Lung": "看肺部和气道。",
+        "Bone": "让骨头和骨折更清楚。",
+        "Brain": "脑部常用视窗。",
+        "Abdomen": "看腹部器官。",
+        "Liver": "看肝脏更清楚。",
+        "Mediastinum": "看胸部中间区域。",
+        "Spine": "看脊柱与椎管。",
+        "Pelvis": "看骨盆器官。",
+        "Head/Neck": "看头颈部软组织。",
+        "CTA/Vascular": "看打显影剂的血管。",
+        "Kidney": "看肾脏更清楚。",
+        "Pancreas": "看胰腺更清楚。",
+        "Trauma": "看受伤的大范围。",
+        "Subdural": "看颅骨下出血。",
+        "Stroke": "看早期中风。",
+        "Body": "全身软组织大范围。",
+        "Extremity/MSK": "看四肢软组织。",
+        "Temporal Bone": "看耳朵附近骨头。",
+        "Sinus": "看鼻窦。",
+        "Angio Bone Sub": "去掉骨头后看血管。",
+        "Lung HRCT": "更细的肺部细节。",
+        "Orbits": "看眼眶。",
+        "CTA Head/Neck": "看头颈部血管。",
+        "Arterial": "动脉期血管。",
+        "Venous": "静脉期血管。",
+        "Colon/Bowel": "看肠道和肠壁。",
+        "Adrenal": "看肾上腺。",
+        "Gallbladder": "看胆囊和胆道。",
+        "Skin/Subcutaneous": "看皮肤和皮下脂肪。",
+        "Cardiac": "看心脏软组织。",
+    },
+    "es": {
+        "Soft Tissue": "Para la mayoría de órganos y músculos.",
+        "Lung": "Para ver pulmones y vías aéreas.",
+        "Bone": "Hace más claros los huesos y fracturas.",
+        "Brain": "Vista estándar del cerebro.",
+        "Abdomen": "Vista general del abdomen.",
+        "Liver": "Para ver el hígado con más detalle.",
+        "Mediastinum": "Muestra el centro del pecho.",
+        "Spine": "Para revisar la columna y el canal.",
+        "Pelvis": "Vista general de la pelvis.",
+        "Head/Neck": "Para tejidos de cabeza y cuello.",
+        "CTA/Vascular": "Para vasos con contraste.",
+        "Kidney": "Para ver los riñones.",
+        "Pancreas": "Para ver el páncreas.",
+        "Trauma": "Vista amplia para lesiones.",
+        "Subdural": "Para ver sangrado bajo el cráneo.",
+        "Stroke": "Vista estrecha para ictus temprano.",
+        "Body": "Vista amplia de tejidos blandos.",
+        "Extremity/MSK": "Para tejidos de brazos y piernas.",
+        "Temporal Bone": "Vista muy amplia del temporal.",
+        "Sinus": "Para los senos paranasales.",
+        "Angio Bone Sub": "Vasos con hueso removido.",
+        "Lung HRCT": "Más detalle del pulmón.",
+        "Orbits": "Para las órbitas de los ojos.",
+        "CTA Head/Neck": "Vasos de cabeza y cuello.",
+        "Arterial": "Vasos en fase arterial.",
+        "Venous": "Vasos en fase venosa.",
+        "Colon/Bowel": "Para colon e intestino.",
+        "Adrenal": "Para glándulas suprarrenales.",
+        "Gallbladder": "Para vesícula y vía biliar.",
+        "Skin/Subcutaneous": "Para piel y grasa.",
+        "Cardiac": "Para tejidos del corazón.",
+    },
+}
+
+
+def _tutorial_url(language: str, preset: str) -> str:
+    """Build the tutorial link for a preset in the given language."""
+    page = _TUTORIAL_PAGES.get(language, _TUTORIAL_PAGES["en"])
+    if preset not in _PRESET_DESCRIPTIONS["en"]:
+        return page
+    anchor = preset.lower().replace("/", "-").replace(" ", "-")
+    return f"{page}#{anchor}"
+
+
+@lru_cache(maxsize=len(_TUTORIAL_PAGES) + 1)
+def _tutorial_links_for(language: str) -> dict[str, str]:
+    """Preset-to-link map for one language; the tables are immutable, so the
+    sidebar var can hand out the same dict instead of rebuilding 31 entries
+    on every state read."""
+    return {preset: _tutorial_url(language, preset) for preset in _PRESETS}
 
 
 class DicomViewerState(rx.State):
@@ -22,13 +627,20 @@ class DicomViewerState(rx.State):
     directory_browser_error: str = ""
     suppress_directory_dialog: bool = False
     workflow_step: str = "select"
-    dicom_files: list[str] = []
+    _dicom_files: list[str] = []
+    _scan_meta: dict[str, dict] = {}
     file_names: list[str] = []
+    file_list_limit: int = 200
     current_index: int = 0
     is_loading: bool = False
+    scan_progress: int = 0
+    scan_total: int = 0
     error_message: str = ""
     has_loaded: bool = False
     current_image_base64: str = "/placeholder.svg"
+    image_format: str = "jpeg"
+    viewer_max_dim: int = 1024
+    is_dragging: bool = False
     window_center: float = 40.0
     window_width: float = 400.0
     zoom_level: float = 1.0
@@ -55,339 +667,43 @@ class DicomViewerState(rx.State):
     metadata_password_input: str = ""
     metadata_password_error: str = ""
     _cached_pixel_array: np.ndarray | None = None
-    _cached_rescale_slope: float = 1.0
-    _cached_rescale_intercept: float = 0.0
-    _default_tutorial_links: dict[str, str] = {
-        # Use same-origin static assets so the tutorial can be embedded in an iframe.
-        # (Many external sites, including Wikipedia, block iframe embedding.)
-        "en": "/tutorials/windowing_en.html",
-        "zh-TW": "/tutorials/windowing_zh_tw.html",
-        "zh-CN": "/tutorials/windowing_zh_cn.html",
-        "es": "/tutorials/windowing_es.html",
-    }
-    _preset_tutorial_links: dict[str, dict[str, str]] = {
-        "en": {
-            "Soft Tissue": "/tutorials/windowing_en.html#soft-tissue",
-            "Lung": "/tutorials/windowing_en.html#lung",
-            "Bone": "/tutorials/windowing_en.html#bone",
-            "Brain": "/tutorials/windowing_en.html#brain",
-            "Abdomen": "/tutorials/windowing_en.html#abdomen",
-            "Liver": "/tutorials/windowing_en.html#liver",
-            "Mediastinum": "/tutorials/windowing_en.html#mediastinum",
-            "Spine": "/tutorials/windowing_en.html#spine",
-            "Pelvis": "/tutorials/windowing_en.html#pelvis",
-            "Head/Neck": "/tutorials/windowing_en.html#head-neck",
-            "CTA/Vascular": "/tutorials/windowing_en.html#cta-vascular",
-            "Kidney": "/tutorials/windowing_en.html#kidney",
-            "Pancreas": "/tutorials/windowing_en.html#pancreas",
-            "Trauma": "/tutorials/windowing_en.html#trauma",
-            "Subdural": "/tutorials/windowing_en.html#subdural",
-            "Stroke": "/tutorials/windowing_en.html#stroke",
-            "Body": "/tutorials/windowing_en.html#body",
-            "Extremity/MSK": "/tutorials/windowing_en.html#extremity-msk",
-            "Temporal Bone": "/tutorials/windowing_en.html#temporal-bone",
-            "Sinus": "/tutorials/windowing_en.html#sinus",
-            "Angio Bone Sub": "/tutorials/windowing_en.html#angio-bone-sub",
-            "Lung HRCT": "/tutorials/windowing_en.html#lung-hrct",
-            "Orbits": "/tutorials/windowing_en.html#orbits",
-            "CTA Head/Neck": "/tutorials/windowing_en.html#cta-head-neck",
-            "Arterial": "/tutorials/windowing_en.html#arterial",
-            "Venous": "/tutorials/windowing_en.html#venous",
-            "Colon/Bowel": "/tutorials/windowing_en.html#colon-bowel",
-            "Adrenal": "/tutorials/windowing_en.html#adrenal",
-            "Gallbladder": "/tutorials/windowing_en.html#gallbladder",
-            "Skin/Subcutaneous": "/tutorials/windowing_en.html#skin-subcutaneous",
-            "Cardiac": "/tutorials/windowing_en.html#cardiac",
-        },
-        "zh-TW": {
-            "Soft Tissue": "/tutorials/windowing_zh_tw.html#soft-tissue",
-            "Lung": "/tutorials/windowing_zh_tw.html#lung",
-            "Bone": "/tutorials/windowing_zh_tw.html#bone",
-            "Brain": "/tutorials/windowing_zh_tw.html#brain",
-            "Abdomen": "/tutorials/windowing_zh_tw.html#abdomen",
-            "Liver": "/tutorials/windowing_zh_tw.html#liver",
-            "Mediastinum": "/tutorials/windowing_zh_tw.html#mediastinum",
-            "Spine": "/tutorials/windowing_zh_tw.html#spine",
-            "Pelvis": "/tutorials/windowing_zh_tw.html#pelvis",
-            "Head/Neck": "/tutorials/windowing_zh_tw.html#head-neck",
-            "CTA/Vascular": "/tutorials/windowing_zh_tw.html#cta-vascular",
-            "Kidney": "/tutorials/windowing_zh_tw.html#kidney",
-            "Pancreas": "/tutorials/windowing_zh_tw.html#pancreas",
-            "Trauma": "/tutorials/windowing_zh_tw.html#trauma",
-            "Subdural": "/tutorials/windowing_zh_tw.html#subdural",
-            "Stroke": "/tutorials/windowing_zh_tw.html#stroke",
-            "Body": "/tutorials/windowing_zh_tw.html#body",
-            "Extremity/MSK": "/tutorials/windowing_zh_tw.html#extremity-msk",
-            "Temporal Bone": "/tutorials/windowing_zh_tw.html#temporal-bone",
-            "Sinus": "/tutorials/windowing_zh_tw.html#sinus",
-            "Angio Bone Sub": "/tutorials/windowing_zh_tw.html#angio-bone-sub",
-            "Lung HRCT": "/tutorials/windowing_zh_tw.html#lung-hrct",
-            "Orbits": "/tutorials/windowing_zh_tw.html#orbits",
-            "CTA Head/Neck": "/tutorials/windowing_zh_tw.html#cta-head-neck",
-            "Arterial": "/tutorials/windowing_zh_tw.html#arterial",
-            "Venous": "/tutorials/windowing_zh_tw.html#venous",
-            "Colon/Bowel": "/tutorials/windowing_zh_tw.html#colon-bowel",
-            "Adrenal": "/tutorials/windowing_zh_tw.html#adrenal",
-            "Gallbladder": "/tutorials/windowing_zh_tw.html#gallbladder",
-            "Skin/Subcutaneous": "/tutorials/windowing_zh_tw.html#skin-subcutaneous",
-            "Cardiac": "/tutorials/windowing_zh_tw.html#cardiac",
-        },
-        "zh-CN": {
-                "Soft Tissue": "/tutorials/windowing_zh_cn.html#soft-tissue",
-                "Lung": "/tutorials/windowing_zh_cn.html#lung",
-                "Bone": "/tutorials/windowing_zh_cn.html#bone",
-                "Brain": "/tutorials/windowing_zh_cn.html#brain",
-                "Abdomen": "/tutorials/windowing_zh_cn.html#abdomen",
-                "Liver": "/tutorials/windowing_zh_cn.html#liver",
-                "Mediastinum": "/tutorials/windowing_zh_cn.html#mediastinum",
-                "Spine": "/tutorials/windowing_zh_cn.html#spine",
-                "Pelvis": "/tutorials/windowing_zh_cn.html#pelvis",
-                "Head/Neck": "/tutorials/windowing_zh_cn.html#head-neck",
-                "CTA/Vascular": "/tutorials/windowing_zh_cn.html#cta-vascular",
-                "Kidney": "/tutorials/windowing_zh_cn.html#kidney",
-                "Pancreas": "/tutorials/windowing_zh_cn.html#pancreas",
-                "Trauma": "/tutorials/windowing_zh_cn.html#trauma",
-                "Subdural": "/tutorials/windowing_zh_cn.html#subdural",
-                "Stroke": "/tutorials/windowing_zh_cn.html#stroke",
-                "Body": "/tutorials/windowing_zh_cn.html#body",
-                "Extremity/MSK": "/tutorials/windowing_zh_cn.html#extremity-msk",
-                "Temporal Bone": "/tutorials/windowing_zh_cn.html#temporal-bone",
-                "Sinus": "/tutorials/windowing_zh_cn.html#sinus",
-                "Angio Bone Sub": "/tutorials/windowing_zh_cn.html#angio-bone-sub",
-                "Lung HRCT": "/tutorials/windowing_zh_cn.html#lung-hrct",
-                "Orbits": "/tutorials/windowing_zh_cn.html#orbits",
-                "CTA Head/Neck": "/tutorials/windowing_zh_cn.html#cta-head-neck",
-                "Arterial": "/tutorials/windowing_zh_cn.html#arterial",
-                "Venous": "/tutorials/windowing_zh_cn.html#venous",
-                "Colon/Bowel": "/tutorials/windowing_zh_cn.html#colon-bowel",
-                "Adrenal": "/tutorials/windowing_zh_cn.html#adrenal",
-                "Gallbladder": "/tutorials/windowing_zh_cn.html#gallbladder",
-                "Skin/Subcutaneous": "/tutorials/windowing_zh_cn.html#skin-subcutaneous",
-                "Cardiac": "/tutorials/windowing_zh_cn.html#cardiac",
-            },
-            "es": {
-                "Soft Tissue": "/tutorials/windowing_es.html#soft-tissue",
-                "Lung": "/tutorials/windowing_es.html#lung",
-                "Bone": "/tutorials/windowing_es.html#bone",
-                "Brain": "/tutorials/windowing_es.html#brain",
-                "Abdomen": "/tutorials/windowing_es.html#abdomen",
-                "Liver": "/tutorials/windowing_es.html#liver",
-                "Mediastinum": "/tutorials/windowing_es.html#mediastinum",
-                "Spine": "/tutorials/windowing_es.html#spine",
-                "Pelvis": "/tutorials/windowing_es.html#pelvis",
-                "Head/Neck": "/tutorials/windowing_es.html#head-neck",
-                "CTA/Vascular": "/tutorials/windowing_es.html#cta-vascular",
-                "Kidney": "/tutorials/windowing_es.html#kidney",
-                "Pancreas": "/tutorials/windowing_es.html#pancreas",
-                "Trauma": "/tutorials/windowing_es.html#trauma",
-                "Subdural": "/tutorials/windowing_es.html#subdural",
-                "Stroke": "/tutorials/windowing_es.html#stroke",
-                "Body": "/tutorials/windowing_es.html#body",
-                "Extremity/MSK": "/tutorials/windowing_es.html#extremity-msk",
-                "Temporal Bone": "/tutorials/windowing_es.html#temporal-bone",
-                "Sinus": "/tutorials/windowing_es.html#sinus",
-                "Angio Bone Sub": "/tutorials/windowing_es.html#angio-bone-sub",
-                "Lung HRCT": "/tutorials/windowing_es.html#lung-hrct",
-                "Orbits": "/tutorials/windowing_es.html#orbits",
-                "CTA Head/Neck": "/tutorials/windowing_es.html#cta-head-neck",
-                "Arterial": "/tutorials/windowing_es.html#arterial",
-                "Venous": "/tutorials/windowing_es.html#venous",
-                "Colon/Bowel": "/tutorials/windowing_es.html#colon-bowel",
-                "Adrenal": "/tutorials/windowing_es.html#adrenal",
-                "Gallbladder": "/tutorials/windowing_es.html#gallbladder",
-                "Skin/Subcutaneous": "/tutorials/windowing_es.html#skin-subcutaneous",
-                "Cardiac": "/tutorials/windowing_es.html#cardiac",
-            },
-    }
-
-    _preset_descriptions: dict[str, dict[str, str]] = {
-        "en": {
-            "Soft Tissue": "Good for most organs and muscles.",
-            "Lung": "Best for seeing lungs and airways.",
-            "Bone": "Makes bones and fractures easy to see.",
-            "Brain": "Standard view for brain tissue.",
-            "Abdomen": "General view for belly organs.",
-            "Liver": "Clearer view of the liver.",
-            "Mediastinum": "Shows the middle chest area.",
-            "Spine": "Helps check the spine and canal.",
-            "Pelvis": "General view of pelvic organs.",
-            "Head/Neck": "Shows soft tissues in head/neck.",
-            "CTA/Vascular": "Shows blood vessels with contrast.",
-            "Kidney": "Helps see kidneys clearly.",
-            "Pancreas": "Better view of the pancreas.",
-            "Trauma": "Wide view for injuries.",
-            "Subdural": "Helps see bleeding under the skull.",
-            "Stroke": "Narrow brain view for early stroke.",
-            "Body": "Wide soft-tissue view for whole body.",
-            "Extremity/MSK": "For arms/legs soft tissues.",
-            "Temporal Bone": "Very wide view for ear bones.",
-            "Sinus": "For sinuses around the nose.",
-            "Angio Bone Sub": "Shows vessels after bone is removed.",
-            "Lung HRCT": "Extra detail for lungs.",
-            "Orbits": "For the eye sockets.",
-            "CTA Head/Neck": "Vessels in head and neck.",
-            "Arterial": "Artery phase vessels.",
-            "Venous": "Vein phase vessels.",
-            "Colon/Bowel": "For colon and bowel walls.",
-            "Adrenal": "For adrenal glands.",
-            "Gallbladder": "For gallbladder and bile ducts.",
-            "Skin/Subcutaneous": "For skin and fat layer.",
-            "Cardiac": "For heart soft tissues.",
-        },
-        "zh-TW": {
-            "Soft Tissue": "看大部分器官與肌肉。",
-            "Lung": "看肺部與氣道。",
-            "Bone": "讓骨頭和骨折更清楚。",
-            "Brain": "腦部常用視窗。",
-            "Abdomen": "看腹部器官。",
-            "Liver": "看肝臟更清楚。",
-            "Mediastinum": "看胸部中間區域。",
-            "Spine": "看脊椎與椎管。",
-            "Pelvis": "看骨盆器官。",
-            "Head/Neck": "看頭頸部軟組織。",
-            "CTA/Vascular": "看打顯影劑的血管。",
-            "Kidney": "看腎臟更清楚。",
-            "Pancreas": "看胰臟更清楚。",
-            "Trauma": "看受傷的大範圍。",
-            "Subdural": "看頭骨下出血。",
-            "Stroke": "看早期中風。",
-            "Body": "全身軟組織大範圍。",
-            "Extremity/MSK": "看四肢軟組織。",
-            "Temporal Bone": "看耳朵附近骨頭。",
-            "Sinus": "看鼻竇。",
-            "Angio Bone Sub": "扣掉骨頭後看血管。",
-            "Lung HRCT": "更細的肺部細節。",
-            "Orbits": "看眼眶。",
-            "CTA Head/Neck": "看頭頸部血管。",
-            "Arterial": "動脈期血管。",
-            "Venous": "靜脈期血管。",
-            "Colon/Bowel": "看腸道和腸壁。",
-            "Adrenal": "看腎上腺。",
-            "Gallbladder": "看膽囊和膽道。",
-            "Skin/Subcutaneous": "看皮膚和皮下脂肪。",
-            "Cardiac": "看心臟軟組織。",
-        },
-        "zh-CN": {
-            "Soft Tissue": "看大部分器官和肌肉。",
-            "Lung": "看肺部和气道。",
-            "Bone": "让骨头和骨折更清楚。",
-            "Brain": "脑部常用视窗。",
-            "Abdomen": "看腹部器官。",
-            "Liver": "看肝脏更清楚。",
-            "Mediastinum": "看胸部中间区域。",
-            "Spine": "看脊柱与椎管。",
-            "Pelvis": "看骨盆器官。",
-            "Head/Neck": "看头颈部软组织。",
-            "CTA/Vascular": "看打显影剂的血管。",
-            "Kidney": "看肾脏更清楚。",
-            "Pancreas": "看胰腺更清楚。",
-            "Trauma": "看受伤的大范围。",
-            "Subdural": "看颅骨下出血。",
-            "Stroke": "看早期中风。",
-            "Body": "全身软组织大范围。",
-            "Extremity/MSK": "看四肢软组织。",
-            "Temporal Bone": "看耳朵附近骨头。",
-            "Sinus": "看鼻窦。",
-            "Angio Bone Sub": "去掉骨头后看血管。",
-            "Lung HRCT": "更细的肺部细节。",
-            "Orbits": "看眼眶。",
-            "CTA Head/Neck": "看头颈部血管。",
-            "Arterial": "动脉期血管。",
-            "Venous": "静脉期血管。",
-            "Colon/Bowel": "看肠道和肠壁。",
-            "Adrenal": "看肾上腺。",
-            "Gallbladder": "看胆囊和胆道。",
-            "Skin/Subcutaneous": "看皮肤和皮下脂肪。",
-            "Cardiac": "看心脏软组织。",
-        },
-        "es": {
-            "Soft Tissue": "Para la mayoría de órganos y músculos.",
-            "Lung": "Para ver pulmones y vías aéreas.",
-            "Bone": "Hace más claros los huesos y fracturas.",
-            "Brain": "Vista estándar del cerebro.",
-            "Abdomen": "Vista general del abdomen.",
-            "Liver": "Para ver el hígado con más detalle.",
-            "Mediastinum": "Muestra el centro del pecho.",
-            "Spine": "Para revisar la columna y el canal.",
-            "Pelvis": "Vista general de la pelvis.",
-            "Head/Neck": "Para tejidos de cabeza y cuello.",
-            "CTA/Vascular": "Para vasos con contraste.",
-            "Kidney": "Para ver los riñones.",
-            "Pancreas": "Para ver el páncreas.",
-            "Trauma": "Vista amplia para lesiones.",
-            "Subdural": "Para ver sangrado bajo el cráneo.",
-            "Stroke": "Vista estrecha para ictus temprano.",
-            "Body": "Vista amplia de tejidos blandos.",
-            "Extremity/MSK": "Para tejidos de brazos y piernas.",
-            "Temporal Bone": "Vista muy amplia del temporal.",
-            "Sinus": "Para los senos paranasales.",
-            "Angio Bone Sub": "Vasos con hueso removido.",
-            "Lung HRCT": "Más detalle del pulmón.",
-            "Orbits": "Para las órbitas de los ojos.",
-            "CTA Head/Neck": "Vasos de cabeza y cuello.",
-            "Arterial": "Vasos en fase arterial.",
-            "Venous": "Vasos en fase venosa.",
-            "Colon/Bowel": "Para colon e intestino.",
-            "Adrenal": "Para glándulas suprarrenales.",
-            "Gallbladder": "Para vesícula y vía biliar.",
-            "Skin/Subcutaneous": "Para piel y grasa.",
-            "Cardiac": "Para tejidos del corazón.",
-        },
-    }
-
-    _metadata_password: str = os.getenv("DICOM_METADATA_PASSWORD", "dicom")
-
-    def _compute_slice_position(self, ds) -> float | None:
-        """Compute slice position along the normal direction when possible."""
-        pos = ds.get("ImagePositionPatient", None)
-        iop = ds.get("ImageOrientationPatient", None)
-        if pos is not None and iop is not None:
-            try:
-                if len(iop) >= 6 and len(pos) >= 3:
-                    row = np.array([float(x) for x in iop[:3]], dtype=float)
-                    col = np.array([float(x) for x in iop[3:6]], dtype=float)
-                    normal = np.cross(row, col)
-                    if np.linalg.norm(normal) > 0:
-                        position = float(np.dot(normal, np.array(pos[:3], dtype=float)))
-                        return position
-            except Exception:
-                pass
-        if pos is not None:
-            try:
-                if len(pos) >= 3:
-                    return float(pos[2])
-            except Exception:
-                pass
-        slice_location = ds.get("SliceLocation", None)
-        if slice_location is not None:
-            try:
-                return float(slice_location)
-            except Exception:
-                return None
-        return None
+    _cached_hu: np.ndarray | None = None
+    _cached_raw: np.ndarray | None = None
+    _cached_slope: float = 1.0
+    _cached_intercept: float = 0.0
+    _invert_output: bool = False
+    _last_render_key: tuple | None = None
+    _render_generation: int = 0
+    # ClassVar keeps this off the per-session state: it is never mutated, so
+    # there is no reason to copy, diff, or serialize it per connection.
+    # Stored pre-hashed so comparisons run over fixed-length digests and the
+    # plaintext never sits in memory past module import.
+    _metadata_password_hash: ClassVar[bytes] = hashlib.sha256(
+        os.getenv("DICOM_METADATA_PASSWORD", "dicom").encode()
+    ).digest()
+
+    def _read_sort_entry(
+        self, file_path: Path
+    ) -> tuple[tuple, str, str, dict[str, str]] | None:
+        """Read one file's header and build its sort entry; None if not DICOM.
 
-    def _dicom_sort_key(self, ds, file_path: Path) -> tuple:
-        """Return a stable sort key for DICOM slice ordering."""
-        series_uid = str(ds.get("SeriesInstanceUID", ""))
-        position = self._compute_slice_position(ds)
-        instance = ds.get("InstanceNumber", None)
+        Entries are cached by (path, mtime, size), so rescanning a folder
+        that has not changed costs one stat per file instead of a parse;
+        any change to a file rotates its key and forces a fresh read.
+        """
         try:
-            instance_val = float(instance) if instance is not None else None
-        except Exception:
-            instance_val = None
-        primary = position if position is not None else (
-            instance_val if instance_val is not None else float("inf")
-        )
-        secondary = instance_val if instance_val is not None else float("inf")
-        return (series_uid, primary, secondary, file_path.name.lower())
+            st = os.stat(file_path)
+        except OSError:
+            return None
+        return _cached_sort_entry(os.fspath(file_path), st.st_mtime_ns, st.st_size)
 
     @rx.var
     def total_images(self) -> int:
-        return len(self.dicom_files)
+        return len(self._dicom_files)
 
     @rx.var
     def current_position_text(self) -> str:
-        if not self.dicom_files:
+        if not self._dicom_files:
             return "0 / 0"
         return f"{self.current_index + 1} / {self.total_images}"
 
@@ -395,6 +711,35 @@ class DicomViewerState(rx.State):
     def slider_max(self) -> int:
         return max(0, self.total_images - 1)
 
+    @rx.var
+    def scan_progress_text(self) -> str:
+        if self.scan_total <= 0:
+            return ""
+        return f"{self.scan_progress} / {self.scan_total} files"
+
+    @rx.var
+    def file_count_label(self) -> str:
+        """Server-computed badge text so the client never counts the list."""
+        return f"{len(self._dicom_files)} images"
+
+    @rx.var
+    def visible_file_names(self) -> list[str]:
+        """Window of the file list actually rendered in the browser.
+
+        Large series (thousands of slices) would otherwise create one DOM
+        row per file; only the first `file_list_limit` rows are mounted and
+        the rest are revealed on demand.
+        """
+        return self.file_names[: self.file_list_limit]
+
+    @rx.var
+    def hidden_file_count(self) -> int:
+        return max(0, len(self.file_names) - self.file_list_limit)
+
+    @rx.event
+    def show_more_files(self):
+        self.file_list_limit += 200
+
     @rx.var
     def can_go_up_directory(self) -> bool:
         current_path = self._normalize_directory_path(self.directory_browser_path)
@@ -409,19 +754,33 @@ class DicomViewerState(rx.State):
             self.error_message = ""
 
     def _normalize_directory_path(self, path: str) -> Path:
-        candidate = Path(path).expanduser()
-        if candidate.exists() and candidate.is_dir():
-            return candidate
-        fallback = Path(self._default_browser_dir).expanduser()
-        return fallback if fallback.exists() and fallback.is_dir() else Path("/")
+        return _normalize_directory_path(path, self._default_browser_dir)
 
     def _load_directory_entries(self, path: Path) -> None:
         try:
-            dirs = sorted(
-                [p for p in path.iterdir() if p.is_dir()],
-                key=lambda p: p.name.lower(),
-            )
-            self.directory_browser_dirs = [str(p) for p in dirs]
+            key = str(path)
+            mtime = path.stat().st_mtime
+            cached = _DIR_CACHE.get(key)
+            if cached is not None and cached[0] == mtime:
+                _DIR_CACHE.move_to_end(key)
+                self.directory_browser_dirs = cached[1]
+                self.directory_browser_error = ""
+                return
+            with os.scandir(path) as it:
+                entries = sorted(
+                    (
+                        (entry.name, entry.path)
+                        for entry in it
+                        if entry.is_dir(follow_symlinks=False)
+                    ),
+                    key=lambda item: item[0].lower(),
+                )
+            child_dirs = [entry_path for _, entry_path in entries]
+            _DIR_CACHE[key] = (mtime, child_dirs)
+            _DIR_CACHE.move_to_end(key)
+            while len(_DIR_CACHE) > _DIR_CACHE_SIZE:
+                _DIR_CACHE.popitem(last=False)
+            self.directory_browser_dirs = child_dirs
             self.directory_browser_error = ""
         except PermissionError as e:
             logging.exception(f"Error scanning directory: {e}")
@@ -469,6 +828,16 @@ class DicomViewerState(rx.State):
         self.directory_browser_path = str(next_path)
         self._load_directory_entries(next_path)
 
+    @rx.event
+    def open_directory_at(self, index: int):
+        """Open a listed child directory by its row index.
+
+        Rows pass their index instead of closing over the path var, so the
+        foreach body compiles to one shared handler call.
+        """
+        if 0 <= index < len(self.directory_browser_dirs):
+            return DicomViewerState.open_directory(self.directory_browser_dirs[index])
+
     @rx.event
     def select_current_directory(self):
         self.directory_path = self.directory_browser_path
@@ -481,10 +850,12 @@ class DicomViewerState(rx.State):
         """Scan the specified directory for DICOM files."""
         async with self:
             self.is_loading = True
+            self.scan_progress = 0
+            self.scan_total = 0
             self.error_message = ""
             self.has_loaded = False
             self.workflow_step = "select"
-            self.dicom_files = []
+            self._dicom_files = []
             self.file_names = []
             self.current_image_base64 = "/placeholder.svg"
             self.metadata_unlocked = False
@@ -502,32 +873,54 @@ class DicomViewerState(rx.State):
                     self.error_message = f"Directory not found: {self.directory_path}"
                     self.is_loading = False
                 return
-            files = sorted([f for f in path.iterdir() if f.is_file()])
-            sortable_dicoms: list[tuple[tuple, Path, str]] = []
-            for file_path in files:
-                try:
-                    ds = pydicom.dcmread(file_path, stop_before_pixels=True)
-                    sort_key = self._dicom_sort_key(ds, file_path)
-                    sortable_dicoms.append(
-                        (sort_key, file_path.absolute(), file_path.name)
-                    )
-                except Exception as e:
-                    logging.exception(f"Skipping invalid DICOM file {file_path}: {e}")
-                    continue
+            # State writes below are grouped into a single `async with self`
+            # block per outcome so Reflex emits one delta (and one client
+            # re-render) per scan instead of one per assignment.
+            with os.scandir(path) as it:
+                files = sorted(
+                    (Path(entry.path) for entry in it if entry.is_file()),
+                    key=lambda p: p.name,
+                )
+            loop = asyncio.get_running_loop()
+            async with self:
+                self.scan_total = len(files)
+                self.scan_progress = 0
+            results = []
+            done = 0
+            futures = [
+                loop.run_in_executor(_SCAN_EXECUTOR, self._read_sort_entry, fp)
+                for fp in files
+            ]
+            for future in asyncio.as_completed(futures):
+                results.append(await future)
+                done += 1
+                # Push progress every batch rather than per file so the
+                # websocket isn't flooded on huge series.
+                if done % 64 == 0 or done == len(files):
+                    async with self:
+                        self.scan_progress = done
+            sortable_dicoms = [r for r in results if r is not None]
             if not sortable_dicoms:
                 async with self:
                     self.error_message = "No valid DICOM files found in this directory."
+                    self.is_loading = False
             else:
-                sortable_dicoms.sort(key=lambda item: item[0])
+                sortable_dicoms = _sort_scan_entries(sortable_dicoms)
                 valid_dicoms = [item[1] for item in sortable_dicoms]
                 valid_names = [item[2] for item in sortable_dicoms]
+                scan_meta = _fold_meta_summary([item[3] for item in sortable_dicoms])
                 async with self:
-                    self.dicom_files = valid_dicoms
+                    self._dicom_files = valid_dicoms
+                    self._scan_meta = scan_meta
                     self.file_names = valid_names
+                    self.file_list_limit = 200
                     self.has_loaded = True
                     self.current_index = 0
                     self.workflow_step = "list"
-                return DicomViewerState.load_selected_image
+                    self.is_loading = False
+                # The first slice is read when the viewer actually opens;
+                # decoding pixels while the user is still on the file list
+                # would be wasted work if they rescan or leave.
         except PermissionError as e:
             logging.exception(f"Error scanning directory: {e}")
             async with self:
@@ -536,12 +929,11 @@ class DicomViewerState(rx.State):
                     "On macOS, grant Terminal/VS Code access to Desktop or "
                     "enable Full Disk Access in System Settings > Privacy & Security."
                 )
+                self.is_loading = False
         except Exception as e:
             logging.exception(f"Error scanning directory: {e}")
             async with self:
                 self.error_message = f"Error accessing directory: {str(e)}"
-        finally:
-            async with self:
                 self.is_loading = False
 
     @rx.event
@@ -550,7 +942,7 @@ class DicomViewerState(rx.State):
         self.error_message = ""
         self.has_loaded = False
         self.workflow_step = "select"
-        self.dicom_files = []
+        self._dicom_files = []
         self.file_names = []
         self.current_index = 0
         self.current_image_base64 = "/placeholder.svg"
@@ -563,7 +955,7 @@ class DicomViewerState(rx.State):
     def open_viewer(self):
         """Navigate to viewer and mark workflow step."""
         self.workflow_step = "viewer"
-        return rx.redirect("/viewer")
+        return [rx.redirect("/viewer"), DicomViewerState.load_selected_image]
 
     @rx.event
     def back_to_results(self):
@@ -574,49 +966,146 @@ class DicomViewerState(rx.State):
     @rx.event
     def handle_file_selection(self, index: int):
         """Select a specific file from the list."""
-        if 0 <= index < len(self.dicom_files):
+        if 0 <= index < len(self._dicom_files):
             self.current_index = index
             return DicomViewerState.load_selected_image
 
     @rx.event(background=True)
     async def load_selected_image(self):
         """Load and process the currently selected DICOM image."""
-        if not self.dicom_files or self.current_index >= len(self.dicom_files):
+        if not self._dicom_files or self.current_index >= len(self._dicom_files):
             return
-        file_path = self.dicom_files[self.current_index]
+        file_path = self._dicom_files[self.current_index]
         try:
-            ds = pydicom.dcmread(file_path)
+            pixel_array, hu, raw, slope, intercept, invert, ds = (
+                await asyncio.to_thread(self._load_slice, file_path)
+            )
             async with self:
-                self._cached_pixel_array = ds.pixel_array
-                self._cached_rescale_slope = getattr(ds, "RescaleSlope", 1.0)
-                self._cached_rescale_intercept = getattr(ds, "RescaleIntercept", 0.0)
+                self._cached_pixel_array = pixel_array
+                self._cached_hu = hu
+                self._cached_raw = raw
+                self._cached_slope = slope
+                self._cached_intercept = intercept
+                self._invert_output = invert
                 self._extract_metadata(ds)
-                self._process_image()
+                key = self._render_key()
+                cached = _RENDER_CACHE.get(key)
+                if cached is not None:
+                    _RENDER_CACHE.move_to_end(key)
+                    self.current_image_base64 = cached
+                    self._last_render_key = key
+            if cached is None:
+                # Render with the state lock released so zoom/pan/toggle
+                # events keep flowing while the frame encodes; only the
+                # publish re-acquires it.
+                b64 = await asyncio.to_thread(self._render_frame)
+                async with self:
+                    self.current_image_base64 = b64
+                    self._last_render_key = key
+                    self._cache_render(key)
+            self._prefetch_neighbors()
         except Exception as e:
             logging.exception(f"Error loading image {file_path}: {e}")
             async with self:
                 self.error_message = self._format_dicom_error(e)
 
-    def _extract_metadata(self, ds):
-        """Extract metadata from DICOM dataset."""
+    def _load_slice(self, file_path) -> tuple:
+        """Read and decode one slice, serving repeats from a small LRU.
+
+        Returns (rgb pixel array or None, HU buffer or None, raw 16-bit
+        frame or None, slope, intercept, invert flag, dataset stripped of
+        pixel bulk for metadata reads). 16-bit integer frames keep their
+        raw form for LUT windowing; everything else gets the float32 fold.
+        """
+        key = os.fspath(file_path)
+        cached = _SLICE_CACHE.get(key)
+        if cached is not None:
+            _SLICE_CACHE.move_to_end(key)
+            return cached
+        # Defer bulk elements (private blobs, overlays) past 1 KB; pydicom
+        # re-reads them from the path on first access, so pixel_array below
+        # still works while untouched large tags never leave the disk.
+        ds = pydicom.dcmread(file_path, defer_size="1 KB")
+        try:
+            n_frames = int(ds.get("NumberOfFrames", 1) or 1)
+        except Exception:
+            n_frames = 1
+        if n_frames > 1:
+            # Multi-frame files: decode only the displayed frame instead of
+            # materializing (and decompressing) the whole stack.
+            pixel_array = pixel_array_from(key, index=0)
+        else:
+            pixel_array = ds.pixel_array
+        is_rgb = pixel_array.ndim == 3 and pixel_array.shape[-1] in (3, 4)
+        hu = None
+        raw = None
+        slope = float(getattr(ds, "RescaleSlope", 1.0))
+        intercept = float(getattr(ds, "RescaleIntercept", 0.0))
+        if not is_rgb:
+            frame = pixel_array
+            if frame.ndim >= 3:
+                try:
+                    frame = frame.reshape((-1,) + frame.shape[-2:])[0]
+                except Exception:
+                    frame = frame[0]
+            if "ModalityLUTSequence" in ds:
+                # Tabular LUTs need pydicom's implementation; fold the
+                # transform in once so re-windows touch float32 only.
+                hu = np.ascontiguousarray(
+                    apply_modality_lut(frame, ds), dtype=np.float32
+                )
+            elif frame.dtype in (np.int16, np.uint16):
+                raw = np.ascontiguousarray(frame)
+            else:
+                hu = frame.astype(np.float32, copy=True)
+                if slope != 1.0 or intercept != 0.0:
+                    # MR/US frames ship identity rescale; skip the no-op pass.
+                    hu *= slope
+                    hu += intercept
+        invert = str(getattr(ds, "PhotometricInterpretation", "")) == "MONOCHROME1"
+        # Drop the bulk bytes before caching; metadata only needs the tags.
+        if "PixelData" in ds:
+            del ds.PixelData
+        ds._pixel_array = None
+        entry = (
+            pixel_array if is_rgb else None,
+            hu,
+            raw,
+            slope,
+            intercept,
+            invert and not is_rgb,
+            ds,
+        )
+        _SLICE_CACHE[key] = entry
+        while len(_SLICE_CACHE) > _SLICE_CACHE_SIZE:
+            _SLICE_CACHE.popitem(last=False)
+        return entry
 
-        @rx.event
-        def get_val(tag, default="N/A"):
-            return str(ds.get(tag, default))
+    def _prefetch_neighbors(self):
+        """Warm the slice cache for the slices a sequential scroll hits next."""
+        for offset in (1, -1, 2):
+            index = self.current_index + offset
+            if 0 <= index < len(self._dicom_files):
+                _SCAN_EXECUTOR.submit(self._load_slice, self._dicom_files[index])
 
-        self.patient_name = get_val("PatientName")
-        self.patient_id = get_val("PatientID")
-        self.study_date = get_val("StudyDate")
-        self.modality = get_val("Modality")
-        self.study_description = get_val("StudyDescription")
-        self.series_description = get_val("SeriesDescription")
+    def _extract_metadata(self, ds):
+        """Extract metadata from DICOM dataset."""
+        for attr, tag in _META_STR_TAGS:
+            setattr(self, attr, str(ds.get(tag, "N/A")))
         pos = ds.get("ImagePositionPatient", None)
+        # Elements of these multi-values are DS objects (str subclasses with
+        # Decimal semantics); one float() each keeps formatting on the plain
+        # float fast path.
         self.image_position = (
-            f"[{', '.join([f'{x:.1f}' for x in pos])}]" if pos else "N/A"
+            f"[{float(pos[0]):.1f}, {float(pos[1]):.1f}, {float(pos[2]):.1f}]"
+            if pos is not None and len(pos) >= 3
+            else "N/A"
         )
         spacing = ds.get("PixelSpacing", None)
         self.pixel_spacing = (
-            f"{spacing[0]:.3f} x {spacing[1]:.3f} mm" if spacing else "N/A"
+            f"{float(spacing[0]):.3f} x {float(spacing[1]):.3f} mm"
+            if spacing
+            else "N/A"
         )
         thickness = ds.get("SliceThickness", None)
         self.slice_thickness = f"{thickness} mm" if thickness else "N/A"
@@ -635,7 +1124,10 @@ class DicomViewerState(rx.State):
 
     @rx.event
     def unlock_metadata(self):
-        if self.metadata_password_input == self._metadata_password:
+        if hmac.compare_digest(
+            hashlib.sha256(self.metadata_password_input.encode()).digest(),
+            self._metadata_password_hash,
+        ):
             self.metadata_unlocked = True
             self.metadata_password_input = ""
             self.metadata_password_error = ""
@@ -648,52 +1140,166 @@ class DicomViewerState(rx.State):
         self.metadata_password_input = ""
         self.metadata_password_error = ""
 
+    def _render_key(self) -> tuple:
+        """Everything that affects the rendered frame, as a comparable key."""
+        return (
+            self._dicom_files[self.current_index]
+            if self.current_index < len(self._dicom_files)
+            else None,
+            self.window_center,
+            self.window_width,
+            self._cached_slope,
+            self._cached_intercept,
+            self._invert_output,
+            self.image_format,
+            self.zoom_level <= 1.0,
+            self.viewer_max_dim,
+            self.is_dragging,
+        )
+
     def _process_image(self):
         """Apply windowing and convert to base64."""
-        if self._cached_pixel_array is None:
+        if (
+            self._cached_raw is None
+            and self._cached_hu is None
+            and self._cached_pixel_array is None
+        ):
+            return
+        # Throttled sliders and repeated selections often re-enter with the
+        # same inputs; one remembered key skips the whole render in that case.
+        key = self._render_key()
+        if key == self._last_render_key:
+            return
+        cached = _RENDER_CACHE.get(key)
+        if cached is not None:
+            _RENDER_CACHE.move_to_end(key)
+            self.current_image_base64 = cached
+            self._last_render_key = key
             return
         try:
-            pixel_data = self._cached_pixel_array
-            is_rgb = pixel_data.ndim == 3 and pixel_data.shape[-1] in (3, 4)
-            if pixel_data.ndim >= 3 and not is_rgb:
-                try:
-                    pixel_data = pixel_data.reshape((-1,) + pixel_data.shape[-2:])[0]
-                except Exception:
-                    pixel_data = pixel_data[0]
-            if is_rgb:
-                rgb = pixel_data.astype(float)
-                rgb = np.clip(rgb, np.min(rgb), np.max(rgb))
-                if np.max(rgb) != np.min(rgb):
-                    rgb = (rgb - np.min(rgb)) / (np.max(rgb) - np.min(rgb)) * 255.0
-                img_uint8 = rgb.astype(np.uint8)
-                pil_image = Image.fromarray(img_uint8)
-                if pil_image.mode not in ("RGB", "RGBA"):
-                    pil_image = pil_image.convert("RGB")
-            else:
-                pixel_data = pixel_data.astype(float)
-                hu_image = (
-                    pixel_data * self._cached_rescale_slope + self._cached_rescale_intercept
-                )
-                center = self.window_center
-                width = self.window_width
-                min_val = center - width / 2
-                max_val = center + width / 2
-                windowed = np.clip(hu_image, min_val, max_val)
-                if max_val != min_val:
-                    windowed = (windowed - min_val) / (max_val - min_val) * 255.0
-                else:
-                    windowed = windowed * 0
-                img_uint8 = windowed.astype(np.uint8)
-                pil_image = Image.fromarray(img_uint8)
-                if pil_image.mode != "L":
-                    pil_image = pil_image.convert("L")
-            buffer = io.BytesIO()
-            pil_image.save(buffer, format="PNG")
-            b64_string = base64.b64encode(buffer.getvalue()).decode()
-            self.current_image_base64 = f"data:image/png;base64,{b64_string}"
+            self.current_image_base64 = self._render_frame()
+            self._last_render_key = key
+            self._cache_render(key)
         except Exception as e:
             logging.exception(f"Error processing image: {e}")
             self.current_image_base64 = "/placeholder.svg"
+            self._last_render_key = None
+
+    async def _process_image_async(self):
+        """Like _process_image, but renders on a worker thread.
+
+        NumPy and the encoders release the GIL, so pushing the render off
+        the event loop keeps other UI events (zoom, pan, toggles) flowing
+        during window-level drags on large frames.
+        """
+        if (
+            self._cached_raw is None
+            and self._cached_hu is None
+            and self._cached_pixel_array is None
+        ):
+            return
+        key = self._render_key()
+        if key == self._last_render_key:
+            return
+        cached = _RENDER_CACHE.get(key)
+        if cached is not None:
+            _RENDER_CACHE.move_to_end(key)
+            self.current_image_base64 = cached
+            self._last_render_key = key
+            return
+        try:
+            self.current_image_base64 = await asyncio.to_thread(self._render_frame)
+            self._last_render_key = key
+            self._cache_render(key)
+        except Exception as e:
+            logging.exception(f"Error processing image: {e}")
+            self.current_image_base64 = "/placeholder.svg"
+            self._last_render_key = None
+
+    def _cache_render(self, key: tuple):
+        """Remember a finished render for replay on repeat inputs.
+
+        Skipped in frame-URL mode: the cached string would be a URL whose
+        backing payload the frame store may have already evicted.
+        """
+        if _FRAME_URLS_ENABLED:
+            return
+        _RENDER_CACHE[key] = self.current_image_base64
+        while len(_RENDER_CACHE) > _RENDER_CACHE_SIZE:
+            _RENDER_CACHE.popitem(last=False)
+
+    def _render_frame(self) -> str:
+        """Window, downsample and encode the cached slice to a data URL."""
+        raw = self._cached_raw
+        hu = self._cached_hu
+        if self.is_dragging:
+            # Mid-drag frames are transient: window and encode every other
+            # row/column (quarter the pixels) and let the browser stretch
+            # them; the release event re-renders at full resolution.
+            if raw is not None:
+                raw = raw[::2, ::2]
+            if hu is not None:
+                hu = np.ascontiguousarray(hu[::2, ::2])
+        if raw is not None:
+            # 16-bit integers window through a 64 KB LUT: a pure gather,
+            # 2 bytes in / 1 byte out, with no per-pixel float math.
+            lut = _window_lut(
+                raw.dtype.kind == "i",
+                self._cached_slope,
+                self._cached_intercept,
+                float(self.window_center),
+                float(self.window_width),
+                self._invert_output,
+            )
+            img_uint8 = lut[raw.view(np.uint16)]
+        elif hu is None:
+            # Min/max once, then normalize in place: the old clip against
+            # the array's own bounds was a no-op that still streamed the
+            # whole buffer, and min/max were each recomputed three times.
+            rgb = self._cached_pixel_array.astype(np.float32)
+            mn = float(rgb.min())
+            mx = float(rgb.max())
+            if mx != mn:
+                rgb -= mn
+                rgb *= 255.0 / (mx - mn)
+            img_uint8 = rgb.astype(np.uint8)
+        else:
+            center = self.window_center
+            width = self.window_width
+            if _HAS_NUMBA:
+                img_uint8 = np.empty(hu.shape, dtype=np.uint8)
+                _window_kernel(
+                    hu, 1.0, 0.0, float(center), float(width), img_uint8
+                )
+            elif width != 0:
+                # Windowing is memory-bound, so fold it to scale+offset+
+                # clip over one float32 working buffer: a*x+b then clamp
+                # to [0, 255] is algebraically the clip/sub/mul chain.
+                scale = np.float32(255.0 / width)
+                offset = np.float32((width / 2 - center) * (255.0 / width))
+                buf = hu * scale
+                buf += offset
+                np.clip(buf, 0.0, 255.0, out=buf)
+                img_uint8 = buf.astype(np.uint8, copy=False)
+            else:
+                img_uint8 = np.zeros(hu.shape, dtype=np.uint8)
+            if self._invert_output:
+                # MONOCHROME1: low values render white.
+                np.subtract(255, img_uint8, out=img_uint8)
+        if self.zoom_level <= 1.0:
+            # At zoom > 1 the browser magnifies pixels, so keep native
+            # resolution; otherwise cap the payload at viewer_max_dim.
+            img_uint8 = _downscale_frame(img_uint8, self.viewer_max_dim)
+        mime, payload = _encode_frame(img_uint8, self.image_format)
+        if _FRAME_URLS_ENABLED:
+            token = _store_frame(mime, payload)
+            ext = "jpg" if mime == "image/jpeg" else "png"
+            return f"{_FRAME_BASE_URL}/frames/{token}.{ext}"
+        # Concatenate in bytes and decode once: the f-string route
+        # re-encoded the megabyte-scale base64 payload a second time.
+        return (_DATA_URL_PREFIXES[mime] + base64.b64encode(payload)).decode(
+            "ascii"
+        )
 
     def _format_dicom_error(self, error: Exception) -> str:
         message = str(error)
@@ -714,20 +1320,56 @@ class DicomViewerState(rx.State):
     @rx.event
     def update_window_width(self, value: str):
         try:
-            self.window_width = float(value)
-            self.selected_preset = ""
-            self._process_image()
+            new_width = float(value)
         except ValueError as e:
             logging.exception(f"Error updating window width: {e}")
+            return
+        # Throttled sliders re-send the current value on release; bail
+        # before touching state so no diff or render gets scheduled.
+        if new_width == self.window_width:
+            return
+        self.window_width = new_width
+        self.selected_preset = ""
+        self._render_generation += 1
+        return DicomViewerState.debounced_render(self._render_generation)
 
     @rx.event
     def update_window_center(self, value: str):
         try:
-            self.window_center = float(value)
-            self.selected_preset = ""
-            self._process_image()
+            new_center = float(value)
         except ValueError as e:
             logging.exception(f"Error updating window center: {e}")
+            return
+        if new_center == self.window_center:
+            return
+        self.window_center = new_center
+        self.selected_preset = ""
+        self._render_generation += 1
+        return DicomViewerState.debounced_render(self._render_generation)
+
+    @rx.event
+    def begin_drag(self):
+        self.is_dragging = True
+
+    @rx.event
+    async def end_drag(self):
+        self.is_dragging = False
+        await self._process_image_async()
+
+    @rx.event(background=True)
+    async def debounced_render(self, generation: int):
+        """Render once the window values have been stable for 50 ms.
+
+        Every slider event bumps the generation and schedules one of
+        these; any task that wakes up to find a newer generation was
+        superseded mid-drag and returns without encoding a frame, so a
+        burst of events pays for exactly one render.
+        """
+        await asyncio.sleep(0.05)
+        async with self:
+            if generation != self._render_generation:
+                return
+            await self._process_image_async()
 
     @rx.event
     def next_image(self):
@@ -754,7 +1396,12 @@ class DicomViewerState(rx.State):
     @rx.event
     def set_zoom(self, value: float):
         """Set the zoom level within limits."""
+        previous = self.zoom_level
         self.zoom_level = max(0.25, min(4.0, value))
+        # Crossing 1.0 switches between the capped and native-resolution
+        # payloads, so the frame has to be re-encoded.
+        if (previous <= 1.0) != (self.zoom_level <= 1.0):
+            self._process_image()
 
     @rx.event
     def zoom_in(self):
@@ -782,43 +1429,9 @@ class DicomViewerState(rx.State):
     @rx.event
     def apply_preset(self, preset_name: str):
         """Apply a predefined windowing preset."""
-        presets = {
-            "Soft Tissue": (40, 400),
-            "Lung": (-600, 1500),
-            "Bone": (300, 1500),
-            "Brain": (40, 80),
-            "Abdomen": (50, 400),
-            "Liver": (60, 150),
-            "Mediastinum": (40, 350),
-            "Spine": (30, 300),
-            "Pelvis": (50, 450),
-            "Head/Neck": (50, 250),
-            "CTA/Vascular": (150, 600),
-            "Kidney": (30, 300),
-            "Pancreas": (50, 200),
-            "Trauma": (50, 500),
-            "Subdural": (50, 130),
-            "Stroke": (35, 30),
-            "Body": (40, 450),
-            "Extremity/MSK": (40, 350),
-            "Temporal Bone": (700, 4000),
-            "Sinus": (50, 300),
-            "Angio Bone Sub": (300, 1200),
-            "Lung HRCT": (-700, 1200),
-            "Orbits": (50, 300),
-            "CTA Head/Neck": (180, 700),
-            "Arterial": (150, 600),
-            "Venous": (100, 500),
-            "Colon/Bowel": (50, 400),
-            "Adrenal": (40, 300),
-            "Gallbladder": (30, 200),
-            "Skin/Subcutaneous": (50, 250),
-            "Cardiac": (75, 350),
-        }
-        if preset_name in presets:
-            center, width = presets[preset_name]
-            self.window_center = float(center)
-            self.window_width = float(width)
+        preset = _PRESETS.get(preset_name)
+        if preset is not None:
+            self.window_center, self.window_width = preset
             self.selected_preset = preset_name
             self._process_image()
 
@@ -833,19 +1446,11 @@ class DicomViewerState(rx.State):
 
     @rx.event
     def set_tooltip_language(self, value: str):
-        if value in self._preset_descriptions:
+        if value in _PRESET_DESCRIPTIONS:
             self.tooltip_language = value
 
     def _get_tutorial_link(self, preset: str) -> str:
-        links = self._preset_tutorial_links.get(self.tooltip_language, {})
-        if preset in links:
-            return links[preset]
-        fallback_links = self._preset_tutorial_links.get("en", {})
-        if preset in fallback_links:
-            return fallback_links[preset]
-        return self._default_tutorial_links.get(
-            self.tooltip_language, self._default_tutorial_links["en"]
-        )
+        return _tutorial_url(self.tooltip_language, preset)
 
     @rx.event
     def open_tutorial_dialog(self, preset: str):
@@ -862,56 +1467,14 @@ class DicomViewerState(rx.State):
     @rx.var
     def preset_options(self) -> list[str]:
         """Available windowing presets."""
-        return [
-            "Soft Tissue",
-            "Lung",
-            "Bone",
-            "Brain",
-            "Abdomen",
-            "Liver",
-            "Mediastinum",
-            "Spine",
-            "Pelvis",
-            "Head/Neck",
-            "CTA/Vascular",
-            "Kidney",
-            "Pancreas",
-            "Trauma",
-            "Subdural",
-            "Stroke",
-            "Body",
-            "Extremity/MSK",
-            "Temporal Bone",
-            "Sinus",
-            "Angio Bone Sub",
-            "Lung HRCT",
-            "Orbits",
-            "CTA Head/Neck",
-            "Arterial",
-            "Venous",
-            "Colon/Bowel",
-            "Adrenal",
-            "Gallbladder",
-            "Skin/Subcutaneous",
-            "Cardiac",
-        ]
+        return list(_PRESETS)
 
     @rx.var
     def preset_tooltips(self) -> dict[str, str]:
-        return self._preset_descriptions.get(
-            self.tooltip_language, self._preset_descriptions["en"]
+        return _PRESET_DESCRIPTIONS.get(
+            self.tooltip_language, _PRESET_DESCRIPTIONS["en"]
         )
 
     @rx.var
     def preset_tutorial_links(self) -> dict[str, str]:
-        base = {
-            preset: self._default_tutorial_links.get(
-                self.tooltip_language, self._default_tutorial_links["en"]
-            )
-            for preset in self.preset_options
-        }
-        language_links = self._preset_tutorial_links.get(self.tooltip_language, {})
-        fallback_links = self._preset_tutorial_links.get("en", {})
-        base.update(fallback_links)
-        base.update(language_links)
-        return base
+        return _tutorial_links_for(self.tooltip_language)